@@ -17,10 +17,15 @@ depends_on = None
 
 
 def upgrade() -> None:
-    # Add new columns for financial questions
-    op.add_column('user_profiles', sa.Column('savings_info', sa.String(length=500), nullable=True))
-    op.add_column('user_profiles', sa.Column('credit_usage', sa.String(length=500), nullable=True))
-    op.add_column('user_profiles', sa.Column('exchange_preference', sa.String(length=500), nullable=True))
+    # Add new columns for financial questions in a single ALTER, committed on its own
+    # so the table lock is not held for the rest of the migration transaction
+    with op.get_context().autocommit_block():
+        op.execute(
+            "ALTER TABLE user_profiles "
+            "ADD COLUMN savings_info VARCHAR(500), "
+            "ADD COLUMN credit_usage VARCHAR(500), "
+            "ADD COLUMN exchange_preference VARCHAR(500);"
+        )
 
 
 def downgrade() -> None:
@@ -3,38 +3,48 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import make_url
 
 from infrastructure.config import get_settings, setup_logger
-from infrastructure.database import init_db, close_db
+from infrastructure.database import get_engine, init_db, warm_pool, close_db
 from presentation.api.v1.endpoints import chat, health
 
 
+# Settings are cached (lru_cache), resolved once at import and shared below
+settings = get_settings()
+
+
+@asynccontextmanager
+async def _database_lifespan(app: FastAPI):
+    """Create, initialize and pre-warm the shared connection pool."""
+    try:
+        get_engine()  # Shared pooled engine, created once per process
+        await init_db()
+        await warm_pool()
+        yield
+    finally:
+        # Also runs when startup fails, so a half-created engine is disposed
+        await close_db()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
-    # Startup
-    settings = get_settings()
-    
     # Setup logging
-    setup_logger(
+    logger = setup_logger(
         name="interstellar_mare",
         level=settings.log_level,
         log_format=settings.log_format,
     )
     
     # Initialize database
-    print(f"DEBUG: Using database URL: {settings.database_url}")
-    await init_db()
-    
-    yield
-    
-    # Shutdown
-    await close_db()
+    logger.debug("Using database URL: %s", make_url(settings.database_url).render_as_string(hide_password=True))
+    # Nested lifespans: later sub-app lifespans go inside the database one
+    async with _database_lifespan(app):
+        yield
 
 
 # Create FastAPI app
-settings = get_settings()
-
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
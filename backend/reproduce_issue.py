@@ -10,6 +10,19 @@ from infrastructure.llm.information_extractor import InformationExtractor
 from infrastructure.llm.langchain_service import LangChainService
 from infrastructure.config.settings import get_settings
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib encoder
+    orjson = None
+
+
+def _dumps(obj, indent: bool = False) -> str:
+    """Serialize extractor output for printing (orjson when available)."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option).decode()
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False)
+
 async def main():
     print("Testing Information Extraction for User Report...")
     
@@ -21,24 +34,33 @@ async def main():
     message_rooms = "3 oda istiyorum ama odalar cok dar olmasın"
     history_rooms = """Asistan: Kaç oda?
 Kullanıcı: 3 oda"""
-    
-    print(f"\n--- Testing Rooms: '{message_rooms}' ---")
-    result_rooms = await extractor.extract_profile_info(message_rooms, history_rooms)
-    print(json.dumps(result_rooms, indent=2, ensure_ascii=False))
 
     # 2. Test Social Amenities
     message_social = "havuza her sabah girmek isterim. yuruyus parkuru bir de cocuk parkı benim için iyidir"
     history_social = """Asistan: Sosyal alan?
 Kullanıcı: Havuz"""
     
-    # 3. Test Sequential Overwrite
-    print(f"\n--- Testing Overwrite Hypothesis ---")
+    # 3. Test Sequential Overwrite (first message)
     message_seq1 = "3 oda ve havuz istiyorum"
     history_seq1 = ""
-    result1 = await extractor.extract_profile_info(message_seq1, history_seq1)
-    print("Msg 1 (Set values):", json.dumps({k:v for k,v in result1.items() if k in ['rooms', 'social_amenities']}, ensure_ascii=False))
+    
+    # The three extractions are independent -> run them concurrently
+    result_rooms, result_social, result1 = await asyncio.gather(
+        extractor.extract_profile_info(message_rooms, history_rooms),
+        extractor.extract_profile_info(message_social, history_social),
+        extractor.extract_profile_info(message_seq1, history_seq1),
+    )
+    
+    print(f"\n--- Testing Rooms: '{message_rooms}' ---")
+    print(_dumps(result_rooms, indent=True))
+    
+    print(f"\n--- Testing Social Amenities: '{message_social}' ---")
+    print(_dumps(result_social, indent=True))
+    
+    print(f"\n--- Testing Overwrite Hypothesis ---")
+    print("Msg 1 (Set values):", _dumps({k:v for k,v in result1.items() if k in ['rooms', 'social_amenities']}))
     
     message_seq2 = "bekarım ama nisanlanacagım"
     history_seq2 = "Asistan: Oda? Kullanıcı: 3 oda. Asistan: Medeni durum? Kullanıcı: bekar"
     result2 = await extractor.extract_profile_info(message_seq2, history_seq2)
-    print("Msg 2 (Unrelated):", json.dumps({k:v for k,v in result2.items() if k in ['rooms', 'social_amenities']}, ensure_ascii=False))
+    print("Msg 2 (Unrelated):", _dumps({k:v for k,v in result2.items() if k in ['rooms', 'social_amenities']}))
@@ -7,7 +7,9 @@ import asyncio
 import sys
 sys.path.append('src')
 
-from infrastructure.database.session import engine, Base
+from sqlalchemy import text
+
+from infrastructure.database.session import get_engine, close_db, Base
 from infrastructure.config import get_logger
 
 logger = get_logger(__name__)
@@ -15,13 +17,17 @@ logger = get_logger(__name__)
 async def reset_database():
     """Drop all tables and recreate them."""
     try:
-        logger.info("🔥 Dropping all tables...")
+        engine = get_engine()
+        # Drop + create in one transaction: a single commit instead of two
         async with engine.begin() as conn:
+            # Dev-only destructive reset: no need to wait for the WAL fsync
+            await conn.execute(text("SET LOCAL synchronous_commit = off"))
+            
+            logger.info("🔥 Dropping all tables...")
             await conn.run_sync(Base.metadata.drop_all)
-        logger.info("✅ All tables dropped")
-        
-        logger.info("🏗️ Creating fresh tables...")
-        async with engine.begin() as conn:
+            logger.info("✅ All tables dropped")
+            
+            logger.info("🏗️ Creating fresh tables...")
             await conn.run_sync(Base.metadata.create_all)
         logger.info("✅ Fresh database ready!")
         
@@ -29,7 +35,7 @@ async def reset_database():
         logger.error(f"❌ Error: {e}")
         raise
     finally:
-        await engine.dispose()
+        await close_db()
 
 if __name__ == "__main__":
     print("\n⚠️  WARNING: This will DELETE ALL DATA in the database!\n")
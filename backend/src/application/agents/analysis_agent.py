@@ -2,10 +2,157 @@
 
 import re
 import json
-from typing import Optional, List
+import asyncio
+from dataclasses import dataclass
+from bisect import bisect_right
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, List, Mapping
+
 from application.agents.base_agent import BaseAgent
 from domain.entities import UserProfile
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib decoder
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch the stdlib type either way
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+# All profession keywords in one compiled alternation; the named group tells the tier.
+# Keywords must start a word (suffixes like "mühendisi" still match) so they don't fire mid-word.
+# Keywords are stored i-folded (see _fold_i): every dotted/dotless i is written as plain "i".
+_PROFESSION_TIER_RE = re.compile(
+    r"\b(?:(?P<C>pilot|doktor|ceo|yönetic|iş adami|iş kadini|mimar|içmimar)"
+    r"|(?P<B>mühendis|avukat|esnaf|yazilimci))"
+)
+
+# "İ" must be mapped before str.lower(), which would otherwise leave a combining dot behind
+_DOTTED_CAPITAL_I = str.maketrans("İ", "i")
+_DOTLESS_I = str.maketrans("ı", "i")
+
+
+def _fold_i(text: str) -> str:
+    """
+    Lower-case text with every I/İ/ı/i folded to plain "i".
+    
+    Users type both Turkish ("PİLOT", "YAZILIMCI") and ASCII ("PILOT", "EVLI") capitals,
+    so the dotted and dotless forms can't be told apart reliably; fold them together instead.
+    """
+    return text.translate(_DOTTED_CAPITAL_I).lower().translate(_DOTLESS_I)
+
+# Budget ladder: bisect_right(_BUDGET_BREAKS, budget) indexes into _BUDGET_TIERS
+_BUDGET_BREAKS = (7_000_000, 9_000_000, 11_000_000)
+_BUDGET_TIERS = ("A", "A", "B", "C")
+
+# Salary ladder for profiles without a budget: bisect_right(_SALARY_BREAKS, salary) -> (tier, is_near_upgrade)
+_SALARY_BREAKS = (60_000, 80_000, 130_000, 150_000)
+_SALARY_BANDS = (("A", False), ("A", True), ("B", False), ("B", True), ("C", False))
+
+_TIER_MOTIVATIONS = {
+    "A": "Yaşam konforu ve başlangıç seviyesi bir yatırım.",
+    "B": "Prestij, geniş sosyal donatı ve modern yaşam.",
+    "C": "Lüks, özel tasarım ve yüksek yatırım potansiyeli.",
+}
+
+# Read-only: TierAssessment.package hands these out by reference instead of rebuilding them per call
+_PACKAGES = MappingProxyType({tier: MappingProxyType(pkg) for tier, pkg in {
+    "A": {
+        "range": "7 - 9 Milyon TL",
+        "focus": "Yaşam odaklı, aile dostu, bütçe korumalı",
+        "pros": "Düşük aidat, merkezi ulaşım",
+        "cons": "Sosyal tesisler sınırlı olabilir"
+    },
+    "B": {
+        "range": "9 - 11 Milyon TL",
+        "focus": "Geniş metrekare, sosyal donatı, modern mimari",
+        "pros": "Havuz, kapalı otopark, fitness",
+        "cons": "Aidat maliyeti biraz daha yüksek"
+    },
+    "C": {
+        "range": "11 - 15 Milyon TL",
+        "focus": "Lüks, özel tasarım, akıllı ev, yatırım değeri",
+        "pros": "Geniş bahçe/teras, özel güvenlik, yüksek prim potansiyeli",
+        "cons": "Yüksek giriş maliyeti"
+    }
+}.items()})
+
+# Returned as-is by _fallback_guidance on every error/short-circuit path; callers only read from it
+_FALLBACK_RESULT = MappingProxyType({
+    "tier": "A",
+    "package_info": MappingProxyType({"range": "7-9M TL", "focus": "Essential living"}),
+    "guidance_cue": "Yaşam tarzınızdaki bu detaylar, aslında sizin için en huzurlu alanın ipuçlarını veriyor.",
+    "motivation": "Temel analiz",
+    "is_near_upgrade": False,
+    "is_profile_mature": False,
+    "conversation_hooks": (),
+})
+
+
+# JSON object inside an optional ```json fence in the LLM reply
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*({.*?})\s*```', re.DOTALL)
+# One string-aware pass: keep string literals (group 1), drop // comments and commas before } or ]
+_JSON_CLEANUP_RE = re.compile(r'("(?:\\.|[^"\\])*")|//[^\n]*|,(?=\s*[}\]])')
+_DETAILED_ANALYSIS_RE = re.compile(r'"detailed_analysis"\s*:\s*"([^"]+)"')
+
+
+def _clean_json(text: str) -> str:
+    """Strip comments and trailing commas from LLM JSON without touching string contents (e.g. URLs)."""
+    return _JSON_CLEANUP_RE.sub(lambda m: m.group(1) or "", text)
+
+
+# has_children is tri-state; False is an answer and must still be rendered
+_YES_NO = {True: "Var", False: "Yok"}
+
+
+def _profile_block(fields) -> str:
+    """Render "- label: value" lines, leaving out unknown fields so they cost no prompt tokens."""
+    return "\n".join(f"- {label}: {value}" for label, value in fields if value) or "- Henüz bilgi yok"
+
+
+@dataclass(frozen=True, slots=True)
+class TierAssessment:
+    """
+    Immutable result of the tier heuristic.
+    
+    Instances are shared through the heuristic's cache, so they must never be mutated.
+    """
+
+    tier: str
+    motivation: str
+    is_near_upgrade: bool
+
+    @property
+    def package(self) -> Mapping:
+        return _PACKAGES[self.tier]
+
+
+@lru_cache(maxsize=1024)
+def _assess_tier_cached(budget_val: int, salary_val: int, profession: str, marital_status: str) -> TierAssessment:
+    """Pure tier heuristic, memoized on its only inputs."""
+    profession = _fold_i(profession)
+    marital_status = _fold_i(marital_status)
+
+    # Budget-based primary assessment
+    if budget_val > 0:
+        tier = _BUDGET_TIERS[bisect_right(_BUDGET_BREAKS, budget_val)]
+        is_near_upgrade = budget_val < _BUDGET_BREAKS[0]  # Force upgrade focus to reach the 7M floor
+        if is_near_upgrade:
+            return TierAssessment(tier, "Bütçeyi bir tık esneterek kaliteli bir yaşama adım atma potansiyeli.", True)
+        return TierAssessment(tier, _TIER_MOTIVATIONS["A"], False)
+
+    # Fallback to salary/profession if budget not declared; the higher of the two tiers wins
+    tier, is_near_upgrade = _SALARY_BANDS[bisect_right(_SALARY_BREAKS, salary_val)]
+    profession_tier = max((m.lastgroup for m in _PROFESSION_TIER_RE.finditer(profession)), default="A")
+    if profession_tier > tier:
+        tier, is_near_upgrade = profession_tier, False
+    if tier == "B" and marital_status == "evli":
+        is_near_upgrade = True
+
+    return TierAssessment(tier, _TIER_MOTIVATIONS[tier], is_near_upgrade)
+
 
 class AnalysisAgent(BaseAgent):
     """
@@ -125,42 +272,121 @@ Yanıtını KESİNLİKLE JSON formatında üret:
 - VALID JSON only
 """
 
-    async def execute(self, user_profile: UserProfile, chat_history: Optional[List[dict]] = None) -> dict:
+    # User message for execute_structured_analysis, filled with str.format per call
+    STRUCTURED_ANALYSIS_INPUT_TEMPLATE = """
+CHAT GEÇMİŞİ:
+{history}
+
+KULLANICI PROFİLİ:
+{profile_block}
+"""
+
+    # Static frame of the final recommendation prompt, filled with str.format per call
+    FULL_ANALYSIS_PROMPT_TEMPLATE = """
+KULLANICI PROFİLİ:
+- İsim: {name}
+- Meslek: {profession}
+- Lokasyon: {location}
+- Medeni Durum: {marital_status}
+- Hobiler: {hobbies}
+- Bütçe: {budget} TL
+
+DERİN ANALİZ ÇIKTILARI (AGENT 2):
+{lifestyle_context}
+
+SEÇİLEN SEGMENT: {tier} Paketi ({range})
+SEGMENT ODAĞI: {focus}
+
+GÖREV:
+Bu kullanıcıya özel, samimi, bilgece ve heyecan verici bir "Final Önerisi" hazırla.
+- Kullanıcıya ismen hitap et.
+- Neden bu segmentin (A, B veya C) ona çok uygun olduğunu, hobilerine ve yaşam tarzına (yukarıdaki analiz çıktılarına) atıfta bulunarak açıkla.
+- "X paketi size uygun" gibi teknik terimler yerine, "Sizin için seçtiğim bu yaşam konsepti..." gibi sahiplenici bir dil kullan.
+- Konutun sunduğu olanakları (spor, oda sayısı, sessizlik vb.) onun günlük rutinleriyle birleştir.
+- Tonun bilgece, güven verici ve vizyoner olsun.
+- Yanıt 4-5 cümlelik zengin bir metin olsun.
+"""
+
+    # Guidance prompts for _build_guidance_prompt, filled with str.format per call
+    DISCOVERY_GUIDANCE_PROMPT_TEMPLATE = """
+KULLANICI PROFİLİ (Henüz Eksik):
+{profile_block}
+
+KONUŞMA AŞAMASI: TANIŞMA VE YAŞAM TARZI (LIFESTYLE DISCOVERY)
+
+GÖREV:
+Bu kullanıcıyla tanışmaya devam edecek, samimi ve bilgece bir 'sohbete giriş' veya 'ilgi gösterme' cümlesi üret.
+- ASLA evlerden, bütçeden, paketlerden veya "bir tık yatırım" gibi satış ifadelerinden bahsetme.
+- Sadece kullanıcının yaşam tarzını, alışkanlıklarını veya hayata bakışını anlamaya odaklan.
+- "Sizin gibi vizyon sahibi biri..." gibi nazik bir ton kullan ama mülk tanıtımı yapma.
+- Yanıt sadece 1 cümle olsun.
+"""
+
+    SEGMENT_GUIDANCE_PROMPT_TEMPLATE = """
+KULLANICI PROFİLİ:
+{profile_block}
+
+KONUŞMA AŞAMASI: SEGMENT YÖNLENDİRME (STRATEGIC GUIDANCE)
+
+ANALİZİMİZ:
+- SEGMENT: {tier} Paketi ({range})
+- ODAK NOKTASI: {focus}
+- MOTİVASYON: {motivation}
+- {upgrade_text}
+
+GÖREV:
+Bu kullanıcıyı hissettirmeden {tier} segmentindeki bir yaşama yönlendirecek NET ve SONUÇ ODAKLI bir öneri cümlesi üret.
+- Cümle doğal ama profesyonel olsun.
+- "A segmenti size uygun" gibi teknik ifadeler kullanma.
+- "Sizin gibi vizyon sahibi..." gibi iltifatlar YASAK.
+- Örnek: "Bütçe ve yaşam standartlarınız göz önüne alındığında B grubu projelerimizdeki geniş daireler beklentinizi tam karşılayacaktır."
+- Yanıt sadece 1 cümle olsun.
+"""
+
+    # Below both thresholds the structured analysis has nothing to work with
+    MIN_HISTORY_MESSAGES = 4
+    MIN_HISTORY_CHARS = 200
+
+    DEFAULT_GUIDANCE_CUE = "Gelecek hedeflerine uygun en ideal seçenekleri birlikte inceleyelim."
+
+    UPGRADE_HINT = "Kullanıcı bir üst segmente yakın, onu çok hafifçe ve doğal bir şekilde yukarıya (yatırım değeri veya prestij vurgusuyla) teşvik et."
+
+    async def execute(self, user_profile: UserProfile, chat_history: Optional[List[dict]] = None) -> Mapping:
         """
         Produce internal analysis and guidance strategies.
+        
+        Fallback paths return the shared read-only _FALLBACK_RESULT, so callers must treat
+        the result as a Mapping and copy it before changing or serialising it.
         """
         try:
             self._log_execution("Performing internal advisor analysis")
             
             # 1. Structured Analysis (Agent 2 Core)
             structured_result = None
-            if chat_history:
+            if chat_history and self._history_is_rich(chat_history):
                 structured_result = await self.execute_structured_analysis(user_profile, chat_history)
-
-            # 2. Extract Guidance and Segment
-            is_profile_mature = user_profile.is_complete()
-            
-            if structured_result:
-                segment = structured_result.get("user_analysis", {}).get("estimated_budget_segment", "A")
-                guidance = structured_result.get("guidance_message", "Gelecek hedeflerine uygun en ideal seçenekleri birlikte inceleyelim.")
-                
-                return {
-                    "tier": segment,
-                    "guidance_cue": guidance,
-                    "is_profile_mature": is_profile_mature,
-                    "structured_analysis": structured_result
-                }
-            else:
+            if not structured_result:
                 return self._fallback_guidance(user_profile)
+
+            # 2. Extract Guidance and Segment ("user_analysis" may come back as null)
+            user_analysis = structured_result.get("user_analysis") or {}
+            return {
+                "tier": user_analysis.get("estimated_budget_segment", "A"),
+                "guidance_cue": structured_result.get("guidance_message", self.DEFAULT_GUIDANCE_CUE),
+                "is_profile_mature": user_profile.is_complete(),
+                "structured_analysis": structured_result
+            }
             
         except Exception as e:
             self._log_error(e)
             return self._fallback_guidance(user_profile)
             
-        except Exception as e:
-            self._log_error(e)
-            return self._fallback_guidance(user_profile)
-            
+    def _history_is_rich(self, chat_history: List[dict]) -> bool:
+        """Enough conversation for the analysis to find lifestyle signals in."""
+        if len(chat_history) >= self.MIN_HISTORY_MESSAGES:
+            return True
+        return sum(len(m.get("content") or "") for m in chat_history) >= self.MIN_HISTORY_CHARS
+
     async def generate_full_analysis(self, user_profile: UserProfile, structured_analysis: Optional[dict] = None) -> str:
         """
         Final phase: Generate a comprehensive, personalized property recommendation.
@@ -170,41 +396,27 @@ Yanıtını KESİNLİKLE JSON formatında üret:
             if not structured_analysis:
                 # We need history here too for a fresh analysis if not passed
                 # For safety, we use the internal assessment as fallback
-                assessment = self._assess_tier(user_profile)
+                tier = self._assess_tier(user_profile).tier
+                lifestyle_insights = ()
             else:
-                assessment = {
-                    "tier": structured_analysis["user_analysis"]["estimated_budget_segment"],
-                    "package": self._get_package_by_tier(structured_analysis["user_analysis"]["estimated_budget_segment"]),
-                    "lifestyle_insights": structured_analysis["lifestyle_insights"]
-                }
+                tier = structured_analysis["user_analysis"]["estimated_budget_segment"]
+                lifestyle_insights = structured_analysis.get("lifestyle_insights") or ()
             
-            pkg = assessment["package"]
-            lifestyle_context = "\n".join([f"- {i}" for i in assessment.get("lifestyle_insights", [])])
+            pkg = self._get_package_by_tier(tier)
+            lifestyle_context = "\n".join(f"- {i}" for i in lifestyle_insights)
             
-            prompt = f"""
-KULLANICI PROFİLİ:
-- İsim: {user_profile.name}
-- Meslek: {user_profile.profession}
-- Lokasyon: {user_profile.location.city if user_profile.location else user_profile.hometown}
-- Medeni Durum: {user_profile.marital_status}
-- Hobiler: {', '.join(user_profile.hobbies)}
-- Bütçe: {user_profile.budget.max_amount if user_profile.budget else 'Belirsiz'} TL
-
-DERİN ANALİZ ÇIKTILARI (AGENT 2):
-{lifestyle_context}
-
-SEÇİLEN SEGMENT: {assessment['tier']} Paketi ({pkg['range']})
-SEGMENT ODAĞI: {pkg['focus']}
-
-GÖREV:
-Bu kullanıcıya özel, samimi, bilgece ve heyecan verici bir "Final Önerisi" hazırla.
-- Kullanıcıya ismen hitap et.
-- Neden bu segmentin (A, B veya C) ona çok uygun olduğunu, hobilerine ve yaşam tarzına (yukarıdaki analiz çıktılarına) atıfta bulunarak açıkla.
-- "X paketi size uygun" gibi teknik terimler yerine, "Sizin için seçtiğim bu yaşam konsepti..." gibi sahiplenici bir dil kullan.
-- Konutun sunduğu olanakları (spor, oda sayısı, sessizlik vb.) onun günlük rutinleriyle birleştir.
-- Tonun bilgece, güven verici ve vizyoner olsun.
-- Yanıt 4-5 cümlelik zengin bir metin olsun.
-"""
+            prompt = self.FULL_ANALYSIS_PROMPT_TEMPLATE.format(
+                name=user_profile.name,
+                profession=user_profile.profession,
+                location=user_profile.location.city if user_profile.location else user_profile.hometown,
+                marital_status=user_profile.marital_status,
+                hobbies=user_profile.hobbies_text,
+                budget=user_profile.budget.max_amount if user_profile.budget else 'Belirsiz',
+                lifestyle_context=lifestyle_context,
+                tier=tier,
+                range=pkg['range'],
+                focus=pkg['focus'],
+            )
             
             response = await self.llm_service.generate_response(
                 prompt=prompt,
@@ -224,235 +436,165 @@ Bu kullanıcıya özel, samimi, bilgece ve heyecan verici bir "Final Önerisi" h
         Produce a deep, structured JSON analysis of the user potential.
         """
         try:
-            # Format inputs for Agent 2
-            history_str = "\n".join([f"{m.get('role', 'user')}: {m.get('content', '')}" for m in chat_history])
-            
-            input_data = f"""
-CHAT GEÇMİŞİ:
-{history_str}
-
-KULLANICI PROFİLİ:
-- İsim: {profile.name or 'Bilinmiyor'}
-- Meslek: {profile.profession or 'Bilinmiyor'}
-- Şehir: {profile.hometown or 'Bilinmiyor'}
-- Medeni Durum: {profile.marital_status or 'Bilinmiyor'}
-- Hobiler: {', '.join(profile.hobbies) if profile.hobbies else 'Bilinmiyor'}
-- Gelir (Tahmini): {profile.estimated_salary or 'Bilinmiyor'}
-- Bütçe: {profile.budget.max_amount if profile.budget else 'Bilinmiyor'}
-"""
-
             # Get agent-specific settings
             from infrastructure.config import get_settings
             settings = get_settings()
 
-            response = await self.llm_service.generate_response(
+            # Older turns are already distilled into the profile block below; only send the recent window
+            window = settings.analysis_agent_history_window
+            if len(chat_history) > window:
+                self.logger.debug("Trimming analysis history from %d to %d messages", len(chat_history), window)
+                chat_history = chat_history[-window:]
+
+            # Format inputs for Agent 2
+            prefs = profile.property_preferences
+            history_str = "\n".join([f"{m.get('role', 'user')}: {m.get('content', '')}" for m in chat_history])
+            
+            input_data = self.STRUCTURED_ANALYSIS_INPUT_TEMPLATE.format(
+                history=history_str,
+                profile_block=_profile_block((
+                    ("İsim", profile.name),
+                    ("Meslek", profile.profession),
+                    ("Şehir", profile.hometown),
+                    ("Yaşadığı Şehir", profile.current_city),
+                    ("Hedef Lokasyon", profile.location),
+                    ("Medeni Durum", profile.marital_status),
+                    ("Çocuk", _YES_NO.get(profile.has_children)),
+                    ("Hobiler", profile.hobbies_text),
+                    ("Gelir (Tahmini)", profile.estimated_salary),
+                    ("Bütçe", profile.budget.max_amount if profile.budget else None),
+                    ("Birikim", profile.savings_info),
+                    ("Kredi", profile.credit_usage),
+                    ("Takas", profile.exchange_preference),
+                    ("Oda Sayısı", prefs.min_rooms if prefs else None),
+                    ("Sosyal Alanlar", ", ".join(profile.social_amenities or ())),
+                    ("Satın Alma Amacı", profile.purchase_purpose),
+                )),
+            )
+
+            response = await self._generate_with_timeout(
+                settings,
                 prompt=input_data,
                 system_message=self.AGENT2_SYSTEM_PROMPT,
                 temperature=settings.analysis_agent_temperature,
                 max_tokens=settings.analysis_agent_max_tokens,
+                json_mode=settings.analysis_agent_json_mode,
             )
 
-            # Cleanup potential markdown artifacts (Robust Regex)
-            clean_json = response.strip()
-            
-            # Try to find JSON block in markdown code fence
-            json_match = re.search(r'```(?:json)?\s*({.*?})\s*```', clean_json, re.DOTALL)
-            if json_match:
-                clean_json = json_match.group(1)
-            else:
-                # Try finding first { and last }
-                start = clean_json.find("{")
-                end = clean_json.rfind("}")
-                if start != -1 and end != -1:
-                    clean_json = clean_json[start:end+1]
-            
-            # Remove comments (// style) which break JSON
-            clean_json = re.sub(r'//.*?\n', '\n', clean_json)
-            
-            # Remove trailing commas before } or ]
-            clean_json = re.sub(r',\s*([}\]])', r'\1', clean_json)
-            
-            # Try to parse
-            try:
-                return json.loads(clean_json)
-            except json.JSONDecodeError as je:
-                # Log the problematic JSON for debugging
-                self.logger.error(f"JSON Parse Error: {je}")
-                self.logger.error(f"Cleaned JSON: {clean_json[:500]}...")
-                
-                # FALLBACK: Try even more aggressive cleanup
-                try:
-                    clean_json = re.sub(r',\s*}', '}', clean_json)
-                    clean_json = re.sub(r',\s*]', ']', clean_json)
-                    parsed = json.loads(clean_json)
-                    return parsed
-                except:
-                    # LAST RESORT: Extract detailed_analysis manually if JSON is broken
-                    self.logger.warning("JSON parsing failed completely, attempting manual extraction")
-                    try:
-                        # Try to extract detailed_analysis field using regex
-                        detailed_match = re.search(r'"detailed_analysis"\s*:\s*"([^"]+)"', response)
-                        if detailed_match:
-                            detailed_text = detailed_match.group(1)
-                            self.logger.info(f"Manually extracted detailed_analysis: {detailed_text[:100]}...")
-                            # Return minimal valid structure with extracted analysis
-                            return {
-                                "user_analysis": {},
-                                "detailed_analysis": detailed_text,
-                                "lifestyle_insights": [],
-                                "recommendations": [],
-                                "key_considerations": []
-                            }
-                    except Exception as extract_err:
-                        self.logger.error(f"Manual extraction also failed: {extract_err}")
-                    return None
+            # JSON mode makes fences unlikely, but the tolerant parser stays for providers that ignore it
+            return self._parse_structured_response(response)
                 
         except Exception as e:
-            self._log_error(f"Structured analysis failed: {str(e)}")
+            self.logger.error("Structured analysis failed: %s", e, exc_info=True)
             return None
 
-    def _get_package_by_tier(self, tier_code: str) -> dict:
+    def _parse_structured_response(self, response: str) -> Optional[dict]:
+        """Parse the LLM's JSON report, tolerating fences, comments and trailing commas."""
+        # Cleanup potential markdown artifacts (Robust Regex)
+        clean_json = response.strip()
+        
+        # Try to find JSON block in markdown code fence
+        json_match = _JSON_FENCE_RE.search(clean_json)
+        if json_match:
+            clean_json = json_match.group(1)
+        else:
+            # Try finding first { and last }
+            start = clean_json.find("{")
+            end = clean_json.rfind("}")
+            if start != -1 and end != -1:
+                clean_json = clean_json[start:end+1]
+        
+        # Remove // comments and trailing commas before } or ] (string-aware, single pass)
+        clean_json = _clean_json(clean_json)
+        
+        # Try to parse
+        try:
+            return _json_loads(clean_json)
+        except json.JSONDecodeError as je:
+            # Log the problematic JSON for debugging
+            self.logger.error("JSON Parse Error: %s", je)
+            self.logger.error("Cleaned JSON: %.500s...", clean_json)
+            
+            # LAST RESORT: Extract detailed_analysis manually if JSON is broken
+            self.logger.warning("JSON parsing failed completely, attempting manual extraction")
+            try:
+                # Try to extract detailed_analysis field using regex
+                detailed_match = _DETAILED_ANALYSIS_RE.search(response)
+                if detailed_match:
+                    detailed_text = detailed_match.group(1)
+                    self.logger.info("Manually extracted detailed_analysis: %.100s...", detailed_text)
+                    # Return minimal valid structure with extracted analysis
+                    return {
+                        "user_analysis": {},
+                        "detailed_analysis": detailed_text,
+                        "lifestyle_insights": [],
+                        "recommendations": [],
+                        "key_considerations": []
+                    }
+            except Exception as extract_err:
+                self.logger.error("Manual extraction also failed: %s", extract_err)
+            return None
+
+    async def _generate_with_timeout(self, settings, **kwargs) -> str:
+        """LLM call bounded by analysis_agent_timeout; transient provider errors are retried by the client."""
+        try:
+            return await asyncio.wait_for(
+                self.llm_service.generate_response(**kwargs),
+                timeout=settings.analysis_agent_timeout
+            )
+        except asyncio.TimeoutError:
+            self.logger.warning("Structured analysis timed out after %.0fs", settings.analysis_agent_timeout)
+            raise
+
+    def _get_package_by_tier(self, tier_code: Optional[str]) -> Mapping:
         """Helper to get package info from tier letter."""
-        tier_code = tier_code.strip().upper()
-        if "A" in tier_code: return self._get_packages()["A"]
-        if "B" in tier_code: return self._get_packages()["B"]
-        if "C" in tier_code: return self._get_packages()["C"]
-        return self._get_packages()["A"]
-
-    def _get_packages(self) -> dict:
-        return {
-            "A": {
-                "range": "7 - 9 Milyon TL",
-                "focus": "Yaşam odaklı, aile dostu, bütçe korumalı",
-                "pros": "Düşük aidat, merkezi ulaşım",
-                "cons": "Sosyal tesisler sınırlı olabilir"
-            },
-            "B": {
-                "range": "9 - 11 Milyon TL",
-                "focus": "Geniş metrekare, sosyal donatı, modern mimari",
-                "pros": "Havuz, kapalı otopark, fitness",
-                "cons": "Aidat maliyeti biraz daha yüksek"
-            },
-            "C": {
-                "range": "11 - 15 Milyon TL",
-                "focus": "Lüks, özel tasarım, akıllı ev, yatırım değeri",
-                "pros": "Geniş bahçe/teras, özel güvenlik, yüksek prim potansiyeli",
-                "cons": "Yüksek giriş maliyeti"
-            }
-        }
+        # The LLM may return null for the segment; treat it like an unknown code
+        return _PACKAGES.get((tier_code or "A").strip()[:1].upper(), _PACKAGES["A"])
+
+    def _get_packages(self) -> Mapping:
+        return _PACKAGES
 
-    def _assess_tier(self, profile: UserProfile) -> dict:
+    def _assess_tier(self, profile: UserProfile) -> TierAssessment:
         """Internal heuristic for tier assignment with risk appetite and motivation."""
         budget_val = 0
         if profile.budget:
             budget_val = profile.budget.max_amount or profile.budget.min_amount or 0
         
-        salary_val = 0
-        if profile.estimated_salary:
-            try:
-                # Remove non-numeric chars
-                salary_val = int(re.sub(r'[^\d]', '', profile.estimated_salary))
-            except:
-                pass
-        
-        profession = (profile.profession or "").lower()
-        marital_status = (profile.marital_status or "").lower()
+        # Keep only decimal digits (any script, like the regex \d it replaces); int() accepts them all
+        digits = "".join(filter(str.isdecimal, profile.estimated_salary or ""))
+        salary_val = int(digits) if digits else 0
         
-        # Default Tier A (7-9M)
-        tier = "A"
-        motivation = "Yaşam konforu ve başlangıç seviyesi bir yatırım."
-        is_near_upgrade = False
-
-        # Budget-based primary assessment
-        if budget_val > 0:
-            if budget_val < 7000000:
-                tier = "A"
-                is_near_upgrade = True # Force upgrade focus to reach the 7M floor
-                motivation = "Bütçeyi bir tık esneterek kaliteli bir yaşama adım atma potansiyeli."
-            elif 7000000 <= budget_val < 9000000:
-                tier = "A"
-            elif 9000000 <= budget_val < 11000000:
-                tier = "B"
-            elif budget_val >= 11000000:
-                tier = "C"
-        else:
-            # Fallback to salary/profession if budget not declared
-            if salary_val >= 150000 or any(p in profession for p in ["pilot", "doktor", "ceo", "yönetic", "iş adamı", "iş kadını", "mimar"]):
-                tier = "C"
-                motivation = "Lüks, özel tasarım ve yüksek yatırım potansiyeli."
-            elif salary_val >= 80000 or any(p in profession for p in ["mühendis", "avukat", "esnaf", "yazılımcı"]):
-                tier = "B"
-                motivation = "Prestij, geniş sosyal donatı ve modern yaşam."
-                if salary_val >= 130000 or marital_status == "evli":
-                    is_near_upgrade = True
-            else:
-                if salary_val >= 60000:
-                    is_near_upgrade = True
+        # Raw values as cache key; normalisation happens inside the cached function, once per distinct input
+        return _assess_tier_cached(
+            budget_val, salary_val, profile.profession or "", profile.marital_status or ""
+        )
 
-        packages = self._get_packages()
-        
-        return {
-            "tier": tier,
-            "package": packages[tier],
-            "motivation": motivation,
-            "is_near_upgrade": is_near_upgrade
-        }
-
-    def _build_guidance_prompt(self, profile: UserProfile, assessment: dict, is_mature: bool = True) -> str:
+    def _build_guidance_prompt(self, profile: UserProfile, assessment: TierAssessment, is_mature: bool = True) -> str:
         """Prompt for phase-aware conversational cues."""
-        pkg = assessment["package"]
-        
         if not is_mature:
-            return f"""
-KULLANICI PROFİLİ (Henüz Eksik):
-- Meslek: {profile.profession or 'Belirsiz'}
-- Yaşadığı Şehir: {profile.hometown or 'Belirsiz'}
-- Medeni Durum: {profile.marital_status or 'Belirsiz'}
-
-KONUŞMA AŞAMASI: TANIŞMA VE YAŞAM TARZI (LIFESTYLE DISCOVERY)
-
-GÖREV:
-Bu kullanıcıyla tanışmaya devam edecek, samimi ve bilgece bir 'sohbete giriş' veya 'ilgi gösterme' cümlesi üret.
-- ASLA evlerden, bütçeden, paketlerden veya "bir tık yatırım" gibi satış ifadelerinden bahsetme.
-- Sadece kullanıcının yaşam tarzını, alışkanlıklarını veya hayata bakışını anlamaya odaklan.
-- "Sizin gibi vizyon sahibi biri..." gibi nazik bir ton kullan ama mülk tanıtımı yapma.
-- Yanıt sadece 1 cümle olsun.
-"""
-
-        upgrade_text = "Kullanıcı bir üst segmente yakın, onu çok hafifçe ve doğal bir şekilde yukarıya (yatırım değeri veya prestij vurgusuyla) teşvik et." if assessment["is_near_upgrade"] else ""
-        
-        return f"""
-KULLANICI PROFİLİ:
-- Meslek: {profile.profession or 'Belirsiz'}
-- Maaş: {profile.estimated_salary or 'Belirsiz'}
-- Medeni Durum: {profile.marital_status or 'Belirsiz'}
-- Hobiler: {', '.join(profile.hobbies) if profile.hobbies else 'Belirsiz'}
-
-KONUŞMA AŞAMASI: SEGMENT YÖNLENDİRME (STRATEGIC GUIDANCE)
-
-ANALİZİMİZ:
-- SEGMENT: {assessment['tier']} Paketi ({pkg['range']})
-- ODAK NOKTASI: {pkg['focus']}
-- MOTİVASYON: {assessment['motivation']}
-- {upgrade_text}
-
-GÖREV:
-Bu kullanıcıyı hissettirmeden {assessment['tier']} segmentindeki bir yaşama yönlendirecek NET ve SONUÇ ODAKLI bir öneri cümlesi üret.
-- Cümle doğal ama profesyonel olsun.
-- "A segmenti size uygun" gibi teknik ifadeler kullanma.
-- "Sizin gibi vizyon sahibi..." gibi iltifatlar YASAK.
-- Örnek: "Bütçe ve yaşam standartlarınız göz önüne alındığında B grubu projelerimizdeki geniş daireler beklentinizi tam karşılayacaktır."
-- Yanıt sadece 1 cümle olsun.
-"""
+            return self.DISCOVERY_GUIDANCE_PROMPT_TEMPLATE.format(
+                profile_block=_profile_block((
+                    ("Meslek", profile.profession),
+                    ("Yaşadığı Şehir", profile.hometown),
+                    ("Medeni Durum", profile.marital_status),
+                )),
+            )
 
-    def _fallback_guidance(self, user_profile: UserProfile) -> dict:
+        pkg = assessment.package
+        return self.SEGMENT_GUIDANCE_PROMPT_TEMPLATE.format(
+            profile_block=_profile_block((
+                ("Meslek", profile.profession),
+                ("Maaş", profile.estimated_salary),
+                ("Medeni Durum", profile.marital_status),
+                ("Hobiler", profile.hobbies_text),
+            )),
+            tier=assessment.tier,
+            range=pkg["range"],
+            focus=pkg["focus"],
+            motivation=assessment.motivation,
+            upgrade_text=self.UPGRADE_HINT if assessment.is_near_upgrade else "",
+        )
+
+    def _fallback_guidance(self, user_profile: UserProfile) -> Mapping:
         """Safe fallback strategy."""
-        return {
-            "tier": "A",
-            "package_info": {"range": "7-9M TL", "focus": "Essential living"},
-            "guidance_cue": "Yaşam tarzınızdaki bu detaylar, aslında sizin için en huzurlu alanın ipuçlarını veriyor.",
-            "motivation": "Temel analiz",
-            "is_near_upgrade": False,
-            "is_profile_mature": False,
-            "conversation_hooks": []
-        }
+        return _FALLBACK_RESULT
@@ -1,7 +1,7 @@
 """Base agent class for common agent functionality."""
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Mapping, Optional
 
 from application.interfaces import ILLMService, IPromptManager
 from infrastructure.config import get_logger
@@ -31,7 +31,7 @@ class BaseAgent(ABC):
         self.logger = get_logger(self.__class__.__name__)
     
     @abstractmethod
-    async def execute(self, *args, **kwargs) -> dict:
+    async def execute(self, *args, **kwargs) -> Mapping:
         """
         Execute agent logic.
         
@@ -44,11 +44,13 @@ class BaseAgent(ABC):
     
     def _log_execution(self, message: str) -> None:
         """Log agent execution."""
-        self.logger.info(f"[{self.__class__.__name__}] {message}")
+        self.logger.info("[%s] %s", self.__class__.__name__, message)
     
     def _log_error(self, error: Exception) -> None:
         """Log agent error."""
         self.logger.error(
-            f"[{self.__class__.__name__}] Error: {str(error)}",
+            "[%s] Error: %s",
+            self.__class__.__name__,
+            error,
             exc_info=True
         )
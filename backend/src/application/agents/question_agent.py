@@ -11,6 +11,77 @@ from domain.enums import QuestionCategory
 class QuestionAgent(BaseAgent):
     """Agent that selects the next question to ask the user."""
     
+    # Fallback question order (New requirements)
+    _PRIORITY_RANK = {category: rank for rank, category in enumerate((
+        QuestionCategory.NAME,
+        QuestionCategory.SURNAME,
+        QuestionCategory.PROFESSION,
+        QuestionCategory.ESTIMATED_SALARY,
+        QuestionCategory.EMAIL,
+        QuestionCategory.HOMETOWN, # Living place/current city
+        QuestionCategory.LOCATION,
+        QuestionCategory.ROOMS,
+        QuestionCategory.MARITAL_STATUS,
+        QuestionCategory.HOBBIES,
+        QuestionCategory.PHONE_NUMBER,
+    ))}
+    
+    # Fallback questions per category; "{name}" is filled with the user's first name
+    _NATURAL_QUESTIONS = {
+        QuestionCategory.NAME: "Memnun oldum! Sizi hangi isimle tanıyabilirim?",
+        QuestionCategory.SURNAME: "Memnun oldum {name}! Soyadınızı da öğrenebilir miyim?",
+
+        QuestionCategory.EMAIL: (
+            "Harika {name}. Sizinle iletişimde kalabilmemiz için e-posta adresinizi paylaşır mısınız?",
+            "Teşekkürler {name}. Mail adresinizi de alabilir miyim acaba?",
+        ),
+
+        QuestionCategory.PHONE_NUMBER: (
+            "Size hızlıca ulaşabileceğimiz bir telefon numaranız var mı?",
+            "Sizinle irtibatta kalmak adına telefon numaranızı da rica etsem paylaşır mısınız?",
+        ),
+
+        QuestionCategory.HOMETOWN: (
+            "Anladım {name}. Peki, şu an hangi şehir ve semtte oturuyorsunuz?",
+            "{name}, şu an yaşadığınız yer neresi acaba (şehir/ilçe)?",
+        ),
+
+        QuestionCategory.PROFESSION: (
+            "Çok güzel. Ne ile meşgulsünüz, mesleğiniz nedir acaba?",
+            "Anladım. Hangi işle meşgul olduğunuzu da öğrenebilir miyim?",
+        ),
+
+        QuestionCategory.MARITAL_STATUS: (
+            "Sizin için en uygun evi bakarken, medeni durumunuzu da sorsam sorun olur mu? (Evli/Bekar vb.)",
+            "Yaşam alanınızı kiminle paylaşacaksınız, aile durumu nedir acaba?",
+        ),
+
+        QuestionCategory.ESTIMATED_SALARY: (
+            "Bütçenize en uygun seçenekleri sunabilmem için aylık ortalama gelirinizi paylaşır mısınız?",
+            "Size daha doğru önerilerde bulunmak adına, yaklaşık aylık kazancınızı da öğrenebilir miyim?",
+        ),
+
+        QuestionCategory.HOBBIES: (
+            "Harika {name}. Evde zaman geçirirken yapmaktan en çok keyif aldığınız hobileriniz nelerdir?",
+            "Sizin için evde olmazsa olmaz bir hobi alanı gerekir mi, nelerle ilgilenirsiniz?",
+        ),
+
+        QuestionCategory.BUDGET: (
+            "Ev için ayırmayı düşündüğünüz bütçe aralığı yaklaşık nedir?",
+            "Finansal olarak hangi bütçe aralığında seçeneklere bakmak istersiniz?",
+        ),
+
+        QuestionCategory.LOCATION: (
+            "Ev almak istediğiniz, hayalinizdeki o özel semt veya bölge neresi?",
+            "Hangi lokasyonlarda kendinizi daha mutlu ve huzurlu hissedersiniz?",
+        ),
+
+        QuestionCategory.ROOMS: (
+            "Kaç oda, kaç salon bir ev sizin için ideal olur?",
+            "Evde kaç odalı bir plana ihtiyacınız var?",
+        ),
+    }
+    
     async def execute(
         self,
         user_profile: UserProfile,
@@ -75,24 +146,25 @@ GÖREV: Yukarıdaki kurallara göre doğal bir sonraki soruyu veya kapanış cü
 
     def _get_profile_summary(self, profile: UserProfile) -> str:
         """Get brief summary of what we know."""
-        parts = []
-        if profile.name: parts.append(f"- İsim: {profile.name}")
-        if profile.surname: parts.append(f"- Soyisim: {profile.surname}")
-        if profile.profession: parts.append(f"- Meslek: {profile.profession}")
-        if profile.current_city: parts.append(f"- Yaşadığı Yer: {profile.current_city}")
-        if profile.hometown: parts.append(f"- Memleket: {profile.hometown}")
-        if profile.email: parts.append(f"- Email: {profile.email}")
-        if profile.phone_number: parts.append(f"- Telefon: {profile.phone_number}")
-        if profile.estimated_salary: parts.append(f"- Gelir: {profile.estimated_salary}")
-        if profile.marital_status: parts.append(f"- Medeni Durum: {profile.marital_status}")
-        if profile.property_preferences and profile.property_preferences.min_rooms:
-            parts.append(f"- Oda Sayısı: {profile.property_preferences.min_rooms}")
-        if profile.social_amenities: parts.append(f"- Sosyal Alanlar: {', '.join(profile.social_amenities)}")
-        if profile.purchase_purpose: parts.append(f"- Satın Alma Amacı: {profile.purchase_purpose}")
-        if profile.savings_info: parts.append(f"- Birikim: {profile.savings_info}")
-        if profile.credit_usage: parts.append(f"- Kredi: {profile.credit_usage}")
-        if profile.exchange_preference: parts.append(f"- Takas: {profile.exchange_preference}")
-        return "\n".join(parts) if parts else "Hiçbir bilgi yok."
+        prefs = profile.property_preferences
+        fields = (
+            ("İsim", profile.name),
+            ("Soyisim", profile.surname),
+            ("Meslek", profile.profession),
+            ("Yaşadığı Yer", profile.current_city),
+            ("Memleket", profile.hometown),
+            ("Email", profile.email),
+            ("Telefon", profile.phone_number),
+            ("Gelir", profile.estimated_salary),
+            ("Medeni Durum", profile.marital_status),
+            ("Oda Sayısı", prefs.min_rooms if prefs else None),
+            ("Sosyal Alanlar", ", ".join(profile.social_amenities or ())),
+            ("Satın Alma Amacı", profile.purchase_purpose),
+            ("Birikim", profile.savings_info),
+            ("Kredi", profile.credit_usage),
+            ("Takas", profile.exchange_preference),
+        )
+        return "\n".join(f"- {label}: {value}" for label, value in fields if value) or "Hiçbir bilgi yok."
 
     
     def _fallback_question_selection(
@@ -102,36 +174,14 @@ GÖREV: Yukarıdaki kurallara göre doğal bir sonraki soruyu veya kapanış cü
     ) -> dict:
         """Deterministic question selection - no LLM, predictable order."""
         
-        # Priority order (New requirements)
-        priority = [
-            QuestionCategory.NAME,
-            QuestionCategory.SURNAME,
-            QuestionCategory.PROFESSION,
-            QuestionCategory.ESTIMATED_SALARY,
-            QuestionCategory.EMAIL,
-            QuestionCategory.HOMETOWN, # Living place/current city
-            QuestionCategory.LOCATION,
-            QuestionCategory.ROOMS,
-            QuestionCategory.MARITAL_STATUS,
-            QuestionCategory.HOBBIES,
-            QuestionCategory.PHONE_NUMBER,
-        ]
-        
-        for category in priority:
-            if category in unanswered:
-                question = self._get_natural_question(user_profile, category)
-                return {
-                    "question": question,
-                    "category": category.value,
-                    "message": "Anladım.",
-                    "reasoning": "Priority-based selection"
-                }
-        
-        if QuestionCategory.NAME in unanswered:
+        ranked = [category for category in unanswered if category in self._PRIORITY_RANK]
+        if ranked:
+            category = min(ranked, key=self._PRIORITY_RANK.__getitem__)
             return {
-                "question": "İsminizi öğrenebilir miyim?",
-                "category": QuestionCategory.NAME.value,
-                "reasoning": "Fallback to name"
+                "question": self._get_natural_question(user_profile, category),
+                "category": category.value,
+                "message": "Anladım.",
+                "reasoning": "Priority-based selection"
             }
         
         return {
@@ -142,72 +192,9 @@ GÖREV: Yukarıdaki kurallara göre doğal bir sonraki soruyu veya kapanış cü
     
     def _get_natural_question(self, user_profile: UserProfile, category: QuestionCategory) -> str:
         """Get natural, varied questions based on category and context."""
-        name = user_profile.name or ""
-        
-        # Varied connectors for natural flow
-        connectors = ["Peki", "Şimdi", "Harika", "Anladım", "Güzel"]
-        connector = random.choice(connectors)
-        
-        questions = {
-            QuestionCategory.NAME: "Memnun oldum! Sizi hangi isimle tanıyabilirim?",
-            QuestionCategory.SURNAME: f"Memnun oldum {name}! Soyadınızı da öğrenebilir miyim?",
-            
-            QuestionCategory.EMAIL: [
-                f"Harika {name}. Sizinle iletişimde kalabilmemiz için e-posta adresinizi paylaşır mısınız?",
-                f"Teşekkürler {name}. Mail adresinizi de alabilir miyim acaba?",
-            ],
-            
-            QuestionCategory.PHONE_NUMBER: [
-                "Size hızlıca ulaşabileceğimiz bir telefon numaranız var mı?",
-                "Sizinle irtibatta kalmak adına telefon numaranızı da rica etsem paylaşır mısınız?",
-            ],
-            
-            QuestionCategory.HOMETOWN: [
-                f"Anladım {name}. Peki, şu an hangi şehir ve semtte oturuyorsunuz?",
-                f"{name}, şu an yaşadığınız yer neresi acaba (şehir/ilçe)?",
-            ],
-            
-            QuestionCategory.PROFESSION: [
-                "Çok güzel. Ne ile meşgulsünüz, mesleğiniz nedir acaba?",
-                "Anladım. Hangi işle meşgul olduğunuzu da öğrenebilir miyim?",
-            ],
-            
-            QuestionCategory.MARITAL_STATUS: [
-                "Sizin için en uygun evi bakarken, medeni durumunuzu da sorsam sorun olur mu? (Evli/Bekar vb.)",
-                "Yaşam alanınızı kiminle paylaşacaksınız, aile durumu nedir acaba?",
-            ],
-            
-            QuestionCategory.ESTIMATED_SALARY: [
-                "Bütçenize en uygun seçenekleri sunabilmem için aylık ortalama gelirinizi paylaşır mısınız?",
-                "Size daha doğru önerilerde bulunmak adına, yaklaşık aylık kazancınızı da öğrenebilir miyim?",
-            ],
-            
-            QuestionCategory.HOBBIES: [
-                f"Harika {name}. Evde zaman geçirirken yapmaktan en çok keyif aldığınız hobileriniz nelerdir?",
-                f"Sizin için evde olmazsa olmaz bir hobi alanı gerekir mi, nelerle ilgilenirsiniz?",
-            ],
-            
-            QuestionCategory.BUDGET: [
-                "Ev için ayırmayı düşündüğünüz bütçe aralığı yaklaşık nedir?",
-                "Finansal olarak hangi bütçe aralığında seçeneklere bakmak istersiniz?",
-            ],
-            
-            QuestionCategory.LOCATION: [
-                "Ev almak istediğiniz, hayalinizdeki o özel semt veya bölge neresi?",
-                "Hangi lokasyonlarda kendinizi daha mutlu ve huzurlu hissedersiniz?",
-            ],
-            
-            QuestionCategory.ROOMS: [
-                "Kaç oda, kaç salon bir ev sizin için ideal olur?",
-                "Evde kaç odalı bir plana ihtiyacınız var?",
-            ],
-        }
-        
-        question_options = questions.get(category)
-        
-        if isinstance(question_options, list):
-            return random.choice(question_options)
-        elif question_options:
-            return question_options
-        else:
+        question_options = self._NATURAL_QUESTIONS.get(category)
+        if not question_options:
             return f"{category.value} hakkında bilgi verir misiniz?"
+        
+        template = random.choice(question_options) if isinstance(question_options, tuple) else question_options
+        return template.format(name=user_profile.name or "")
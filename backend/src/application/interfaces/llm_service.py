@@ -19,6 +19,7 @@ class ILLMService(ABC):
         system_message: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 1000,
+        json_mode: bool = False,
     ) -> str:
         """
         Generate a response from the LLM.
@@ -28,6 +29,7 @@ class ILLMService(ABC):
             system_message: Optional system message for context
             temperature: Sampling temperature (0.0 to 1.0)
             max_tokens: Maximum tokens in response
+            json_mode: Ask the provider to return a bare JSON object
             
         Returns:
             Generated response text
@@ -1,6 +1,6 @@
 """Process user message - Natural conversation with strong memory."""
 
-from typing import Optional
+from typing import Mapping, Optional
 from uuid import UUID
 from datetime import datetime
 from pathlib import Path
@@ -652,7 +652,7 @@ class ProcessUserMessageUseCase:
 
         return missing
     
-    async def _generate_response(self, profile: UserProfile, conversation: Conversation, missing: list, advisor_analysis: dict) -> str:
+    async def _generate_response(self, profile: UserProfile, conversation: Conversation, missing: list, advisor_analysis: Mapping) -> str:
         """Generate with focus on Discovery (Phase 1) or Guidance (Phase 2)."""
         try:
             is_mature = advisor_analysis.get("is_profile_mature", False)
@@ -891,7 +891,7 @@ Yanıt:"""
             else:
                 parts.append("✓ Çocuk: yok")
         if profile.hobbies:
-            parts.append(f"✓ Hobi: {', '.join(profile.hobbies)}")
+            parts.append(f"✓ Hobi: {profile.hobbies_text}")
         if profile.email:
             parts.append(f"✓ Email: {profile.email}")
         if profile.phone_number:
@@ -921,7 +921,7 @@ Yanıt:"""
         except:
             return Conversation(user_profile_id=user_id)
     
-    def _generate_crm_report(self, profile: UserProfile, advisor_analysis: dict) -> dict:
+    def _generate_crm_report(self, profile: UserProfile, advisor_analysis: Mapping) -> dict:
         """Generate comprehensive CRM report for real estate agent."""
         structured = advisor_analysis.get("structured_analysis", {})
         user_analysis = structured.get("user_analysis", {}) if structured else {}
@@ -102,6 +102,11 @@ class UserProfile:
         all_categories = set(QuestionCategory)
         return all_categories - self.answered_categories
     
+    @property
+    def hobbies_text(self) -> str:
+        """Hobbies joined for prompts; empty string when none are known."""
+        return ", ".join(self.hobbies or ())
+    
     def is_complete(self) -> bool:
         """
         Check if profile has the MANDATORY fields for Agent 2 transition.
@@ -1,11 +1,14 @@
 """Database infrastructure module."""
 
-from .session import get_session, init_db, close_db
+from .session import get_engine, get_session, init_db, warm_pool, bulk_upsert, close_db
 from .models import UserModel, ConversationModel, MessageModel
 
 __all__ = [
+    "get_engine",
     "get_session",
     "init_db",
+    "warm_pool",
+    "bulk_upsert",
     "close_db",
     "UserModel",
     "ConversationModel",
@@ -54,7 +54,8 @@ class ConversationModel(Base):
         "MessageModel",
         back_populates="conversation",
         cascade="all, delete-orphan",
-        order_by="MessageModel.timestamp"
+        order_by="MessageModel.timestamp",
+        lazy="selectin",  # One SELECT ... IN for all loaded conversations (async-safe)
     )
     
     def __repr__(self) -> str:
@@ -1,7 +1,11 @@
 """Database session management with SQLAlchemy async engine."""
 
-from typing import AsyncGenerator
+import asyncio
+from itertools import islice
+from typing import AsyncGenerator, Iterable, Iterator
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     AsyncSession,
     AsyncEngine,
     create_async_engine,
@@ -9,7 +13,9 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.orm import DeclarativeBase
 
-from infrastructure.config import get_settings
+from infrastructure.config import get_settings, get_logger
+
+logger = get_logger(__name__)
 
 
 class Base(DeclarativeBase):
@@ -33,6 +39,7 @@ def get_engine() -> AsyncEngine:
             echo=settings.database_echo,
             pool_size=settings.database_pool_size,
             max_overflow=settings.database_max_overflow,
+            pool_recycle=settings.database_pool_recycle,
             pool_pre_ping=True,
         )
     
@@ -82,6 +89,70 @@ async def init_db() -> None:
         await conn.run_sync(Base.metadata.create_all)
 
 
+async def warm_pool() -> None:
+    """
+    Pre-open database_pool_warm_size connections so the first requests skip connection setup.
+    
+    Connections are opened concurrently and immediately returned to the pool.
+    Warm-up is best effort: failures are logged and startup continues, since
+    requests open their own connections anyway.
+    """
+    engine = get_engine()
+    settings = get_settings()
+    size = min(settings.database_pool_warm_size, settings.database_pool_size)
+    if size <= 0:
+        return
+    
+    async def _open() -> AsyncConnection:
+        return await engine.connect()
+    
+    results = await asyncio.gather(*(_open() for _ in range(size)), return_exceptions=True)
+    conns = [r for r in results if isinstance(r, AsyncConnection)]
+    await asyncio.gather(*(conn.close() for conn in conns), return_exceptions=True)
+    
+    errors = [r for r in results if isinstance(r, Exception)]
+    if errors:
+        logger.warning(
+            "Connection pool warm-up opened %d/%d connections: %s", len(conns), size, errors[0]
+        )
+
+
+def _paginate(rows: Iterable[dict], page_size: int) -> Iterator[list[dict]]:
+    """Yield consecutive pages of at most page_size rows."""
+    iterator = iter(rows)
+    while page := list(islice(iterator, page_size)):
+        yield page
+
+
+async def bulk_upsert(
+    conn: AsyncConnection,
+    sql: str,
+    rows: Iterable[dict],
+    page_size: int = 10000,
+) -> int:
+    """
+    Execute a parameterized INSERT/UPDATE/UPSERT for many rows in pages.
+    
+    Each page is sent as a single executemany call instead of one statement
+    per row. 10k rows per page is a good default for PostgreSQL.
+    
+    Args:
+        conn: Open async connection (caller owns the transaction)
+        sql: Statement with named bind parameters, e.g. "... VALUES (:id, :name)"
+        rows: Parameter dictionaries, one per row
+        page_size: Rows per executemany batch
+        
+    Returns:
+        Number of rows sent
+    """
+    statement = text(sql)
+    total = 0
+    for page in _paginate(rows, page_size):
+        await conn.execute(statement, page)
+        total += len(page)
+    return total
+
+
 async def close_db() -> None:
     """Close database connections."""
     global _engine
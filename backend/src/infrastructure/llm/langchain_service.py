@@ -24,6 +24,7 @@ class LangChainService(ILLMService):
             max_tokens=self.settings.openai_max_tokens,
             openai_api_key=self.settings.openai_api_key,
             base_url=self.settings.openai_base_url,
+            max_retries=self.settings.openai_max_retries,
         )
     
     async def generate_response(
@@ -32,6 +33,7 @@ class LangChainService(ILLMService):
         system_message: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 1000,
+        json_mode: bool = False,
     ) -> str:
         """Generate a response from the LLM."""
         try:
@@ -42,7 +44,11 @@ class LangChainService(ILLMService):
             messages.append(HumanMessage(content=prompt))
             
             # Use bind() to override temperature and max_tokens for this specific call
-            llm_with_config = self.llm.bind(temperature=temperature, max_tokens=max_tokens)
+            bind_kwargs = {"temperature": temperature, "max_tokens": max_tokens}
+            if json_mode:
+                # Native JSON mode: no markdown fences, no prose around the object
+                bind_kwargs["response_format"] = {"type": "json_object"}
+            llm_with_config = self.llm.bind(**bind_kwargs)
             response = await llm_with_config.ainvoke(messages)
             
             return response.content
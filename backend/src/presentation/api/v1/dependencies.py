@@ -1,5 +1,6 @@
 """FastAPI dependency injection setup."""
 
+from functools import lru_cache
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -46,8 +47,14 @@ async def get_conversation_repository(
 
 
 # LLM service dependencies
+@lru_cache()
 def get_llm_service() -> ILLMService:
-    """Get LLM service dependency."""
+    """
+    Get shared LLM service dependency.
+    
+    One instance per process keeps the underlying OpenAI HTTP client, and its
+    keep-alive connection pool, alive across requests instead of re-handshaking.
+    """
     return LangChainService()
 
 
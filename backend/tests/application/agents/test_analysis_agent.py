@@ -0,0 +1,357 @@
+"""Unit tests for AnalysisAgent heuristics."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from application.agents.analysis_agent import AnalysisAgent, _assess_tier_cached, _clean_json
+from domain.entities import UserProfile
+from domain.enums import PropertyType
+from infrastructure.config import get_settings
+from domain.value_objects import Budget, Location, PropertyPreferences
+
+
+@pytest.fixture
+def agent():
+    """AnalysisAgent without LLM/prompt dependencies (heuristics only)."""
+    return AnalysisAgent(llm_service=None, prompt_manager=None)
+
+
+class TestAssessTier:
+    """Test AnalysisAgent._assess_tier() heuristic."""
+
+    @pytest.mark.parametrize("max_amount, expected_tier, near_upgrade", [
+        (5000000, "A", True),
+        (7000000, "A", False),
+        (9000000, "B", False),
+        (10999999, "B", False),
+        (11000000, "C", False),
+    ])
+    def test_budget_drives_tier(self, agent, max_amount, expected_tier, near_upgrade):
+        """Test that a declared budget decides the tier."""
+        profile = UserProfile()
+        profile.budget = Budget(min_amount=0, max_amount=max_amount)
+        result = agent._assess_tier(profile)
+        assert result.tier == expected_tier
+        assert result.is_near_upgrade is near_upgrade
+        assert result.package == agent._get_packages()[expected_tier]
+
+    @pytest.mark.parametrize("salary", [
+        "160.000 TL",
+        "160.000 ₺",
+        "≈160.000 TL",
+        "160.000 TL ✓",
+        "160.000 TL → net",
+        "١٦٠٠٠٠",  # Arabic-Indic digits
+    ])
+    def test_salary_with_currency_text_is_parsed(self, agent, salary):
+        """Test that salary strings with separators, symbols or other digit scripts are parsed."""
+        profile = UserProfile()
+        profile.estimated_salary = salary
+        assert agent._assess_tier(profile).tier == "C"
+
+    @pytest.mark.parametrize("salary, expected_tier, near_upgrade", [
+        ("59.999", "A", False),
+        ("60.000", "A", True),
+        ("80.000", "B", False),
+        ("130.000", "B", True),
+        ("150.000", "C", False),
+    ])
+    def test_salary_bands_without_budget(self, agent, salary, expected_tier, near_upgrade):
+        """Test the salary ladder used when no budget is declared."""
+        profile = UserProfile()
+        profile.estimated_salary = salary
+        result = agent._assess_tier(profile)
+        assert result.tier == expected_tier
+        assert result.is_near_upgrade is near_upgrade
+
+    @pytest.mark.parametrize("salary", ["", "belirtmek istemiyorum", "1000 €"])
+    def test_unparseable_salary_counts_as_zero(self, agent, salary):
+        """Test that salaries without usable digits fall back to the default tier."""
+        profile = UserProfile()
+        profile.estimated_salary = salary
+        assert agent._assess_tier(profile).tier == "A"
+
+    def test_profession_keyword_without_budget(self, agent):
+        """Test profession fallback when no budget or salary is known."""
+        profile = UserProfile()
+        profile.profession = "Yazılımcı"
+        profile.marital_status = "Evli"
+        result = agent._assess_tier(profile)
+        assert result.tier == "B"
+        assert result.is_near_upgrade is True
+
+    @pytest.mark.parametrize("profession", ["PİLOT", "İŞ ADAMI", "YAZILIMCI"])
+    def test_turkish_uppercase_profession_is_matched(self, agent, profession):
+        """Test that dotted/dotless I in upper-case professions still match keywords."""
+        profile = UserProfile()
+        profile.profession = profession
+        assert agent._assess_tier(profile).tier in ("B", "C")
+
+    @pytest.mark.parametrize("profession, expected_tier", [
+        ("PILOT", "C"),
+        ("MIMAR", "C"),
+        ("YÖNETICI", "C"),
+        ("YAZILIMCI", "B"),
+        ("Yazilimci", "B"),
+    ])
+    def test_ascii_uppercase_profession_is_matched(self, agent, profession, expected_tier):
+        """Test that ASCII capitals (I without a dot) still match the keywords."""
+        profile = UserProfile()
+        profile.profession = profession
+        assert agent._assess_tier(profile).tier == expected_tier
+
+    @pytest.mark.parametrize("marital_status", ["Evli", "EVLİ", "EVLI", "evlı"])
+    def test_married_b_tier_is_near_upgrade(self, agent, marital_status):
+        """Test that every spelling of "evli" flags a B-tier profile as near upgrade."""
+        profile = UserProfile()
+        profile.estimated_salary = "80000"
+        profile.marital_status = marital_status
+        result = agent._assess_tier(profile)
+        assert result.tier == "B"
+        assert result.is_near_upgrade is True
+
+    @pytest.mark.parametrize("profession, expected_tier", [
+        ("Makine mühendisi", "B"),
+        ("içmimar", "C"),
+        ("Kilimimari satıcısı", "A"),
+        ("Gazeteci", "A"),
+    ])
+    def test_profession_keywords_match_at_word_start(self, agent, profession, expected_tier):
+        """Test that keywords match word starts only, keeping Turkish suffixes."""
+        profile = UserProfile()
+        profile.profession = profession
+        assert agent._assess_tier(profile).tier == expected_tier
+
+    def test_highest_matching_profession_tier_wins(self, agent):
+        """Test that a profession matching both keyword sets gets the higher tier."""
+        profile = UserProfile()
+        profile.profession = "mühendis ve iş kadını"
+        assert agent._assess_tier(profile).tier == "C"
+
+    def test_empty_profile_defaults_to_a(self, agent):
+        """Test that an empty profile falls back to tier A."""
+        result = agent._assess_tier(UserProfile())
+        assert result.tier == "A"
+        assert result.is_near_upgrade is False
+
+    def test_package_is_shared_and_read_only(self, agent):
+        """Test that the returned package cannot be mutated by callers."""
+        package = agent._assess_tier(UserProfile()).package
+        assert package is agent._get_packages()["A"]
+        with pytest.raises(TypeError):
+            package["range"] = "0 TL"
+
+    def test_assessment_is_immutable(self, agent):
+        """Test that the cached assessment object cannot be modified."""
+        result = agent._assess_tier(UserProfile())
+        with pytest.raises(AttributeError):
+            result.tier = "C"
+
+    def test_repeated_assessment_hits_cache(self, agent):
+        """Test that identical inputs are served from the memoized heuristic."""
+        profile = UserProfile()
+        profile.profession = "Pilot"
+        agent._assess_tier(profile)
+        hits_before = _assess_tier_cached.cache_info().hits
+        agent._assess_tier(profile)
+        assert _assess_tier_cached.cache_info().hits == hits_before + 1
+
+
+class TestGetPackageByTier:
+    """Test AnalysisAgent._get_package_by_tier() lookup."""
+
+    @pytest.mark.parametrize("tier_code, expected", [
+        ("A", "A"),
+        (" b ", "B"),
+        ("C", "C"),
+        ("X", "A"),
+        ("BA", "B"),
+        ("c segment", "C"),
+        ("", "A"),
+        (None, "A"),
+    ])
+    def test_tier_code_lookup(self, agent, tier_code, expected):
+        """Test that the tier letter selects the package, defaulting to A."""
+        assert agent._get_package_by_tier(tier_code) is agent._get_packages()[expected]
+
+
+class TestGuidancePrompt:
+    """Test AnalysisAgent._build_guidance_prompt() profile block."""
+
+    def test_unknown_fields_are_omitted(self, agent):
+        """Test that only known profile fields are rendered into the prompt."""
+        profile = UserProfile()
+        profile.profession = "Mimar"
+        prompt = agent._build_guidance_prompt(profile, agent._assess_tier(profile))
+        assert "- Meslek: Mimar" in prompt
+        assert "Maaş" not in prompt
+        assert "Belirsiz" not in prompt
+
+
+class TestFallbackGuidance:
+    """Test AnalysisAgent._fallback_guidance() shared result."""
+
+    def test_fallback_is_read_only(self, agent):
+        """Test that the shared fallback result cannot be mutated by callers."""
+        result = agent._fallback_guidance(UserProfile())
+        assert result["tier"] == "A"
+        with pytest.raises(TypeError):
+            result["tier"] = "C"
+        with pytest.raises(TypeError):
+            result["package_info"]["range"] = "0 TL"
+
+
+class TestExecute:
+    """Test AnalysisAgent.execute() short-circuits."""
+
+    def test_budget_only_profile_is_analysed(self, fake_llm):
+        """Test that a profile without profession/salary/hobbies/hometown still gets the LLM analysis."""
+        fake_llm.reply = '{"user_analysis": {"estimated_budget_segment": "B"}, "summary": "bütçe odaklı"}'
+        profile = UserProfile()
+        profile.budget = Budget(min_amount=0, max_amount=10_000_000)
+        profile.marital_status = "Evli"
+        history = [{"role": "user", "content": f"mesaj {i}"} for i in range(10)]
+        agent = AnalysisAgent(llm_service=fake_llm, prompt_manager=None)
+        result = asyncio.run(agent.execute(profile, chat_history=history))
+        assert len(fake_llm.calls) == 1
+        assert result["tier"] == "B"
+        assert result["structured_analysis"]["summary"] == "bütçe odaklı"
+
+    @pytest.mark.parametrize("history, expected", [
+        ([{"role": "user", "content": "Merhaba"}], False),
+        ([{"role": "user", "content": "x"}] * 4, True),
+        ([{"role": "user", "content": "x" * 200}], True),
+    ])
+    def test_history_is_rich(self, agent, history, expected):
+        """Test the message-count / length gate for running the structured analysis."""
+        assert agent._history_is_rich(history) is expected
+
+    def test_null_user_analysis_uses_defaults(self, fake_llm):
+        """Test that a report with null user_analysis still yields a tier and cue."""
+        fake_llm.reply = '{"user_analysis": null, "summary": "kısa"}'
+        agent = AnalysisAgent(llm_service=fake_llm, prompt_manager=None)
+        history = [{"role": "user", "content": f"mesaj {i}"} for i in range(AnalysisAgent.MIN_HISTORY_MESSAGES)]
+        result = asyncio.run(agent.execute(UserProfile(profession="Mimar"), chat_history=history))
+        assert result["tier"] == "A"
+        assert result["guidance_cue"] == AnalysisAgent.DEFAULT_GUIDANCE_CUE
+        assert result["structured_analysis"]["summary"] == "kısa"
+
+
+class TestGenerateWithTimeout:
+    """Test AnalysisAgent._generate_with_timeout() bounding of the LLM call."""
+
+    def test_returns_reply(self, fake_llm):
+        """Test that a reply within the timeout is returned as is."""
+        agent = AnalysisAgent(llm_service=fake_llm, prompt_manager=None)
+        settings = SimpleNamespace(analysis_agent_timeout=1)
+        assert asyncio.run(agent._generate_with_timeout(settings, prompt="p")) == "{}"
+        assert len(fake_llm.calls) == 1
+
+    def test_hung_call_times_out_without_retry(self, fake_llm):
+        """Test that a hung call is abandoned after the timeout and not sent again."""
+        fake_llm.delay = 1
+        agent = AnalysisAgent(llm_service=fake_llm, prompt_manager=None)
+        settings = SimpleNamespace(analysis_agent_timeout=0.01)
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(agent._generate_with_timeout(settings, prompt="p"))
+        assert len(fake_llm.calls) == 1
+
+    def test_provider_error_is_not_retried(self, fake_llm):
+        """Test that provider errors propagate on the first failure; retrying is the client's job."""
+        fake_llm.reply = RuntimeError("provider down")
+        agent = AnalysisAgent(llm_service=fake_llm, prompt_manager=None)
+        settings = SimpleNamespace(analysis_agent_timeout=1)
+        with pytest.raises(RuntimeError):
+            asyncio.run(agent._generate_with_timeout(settings, prompt="p"))
+        assert len(fake_llm.calls) == 1
+
+
+class TestParseStructuredResponse:
+    """Test AnalysisAgent._parse_structured_response() cleanup."""
+
+    def test_fenced_json(self, agent):
+        """Test that a ```json fenced reply is unwrapped."""
+        reply = 'İşte analiz:\n```json\n{"summary": "ok"}\n```\nBaşka bir şey?'
+        assert agent._parse_structured_response(reply) == {"summary": "ok"}
+
+    def test_unfenced_json_with_prose(self, agent):
+        """Test that prose around a bare object is dropped."""
+        reply = 'Analiz: {"summary": "ok", "recommendations": ["a",]} bitti.'
+        assert agent._parse_structured_response(reply) == {"summary": "ok", "recommendations": ["a"]}
+
+
+class TestCleanJson:
+    """Test _clean_json() comment and trailing-comma removal."""
+
+    def test_strips_comments_and_trailing_commas(self):
+        """Test that // comments and dangling commas are removed."""
+        text = '{"a": 1, // yorum\n "b": [1, 2,],\n}'
+        assert json.loads(_clean_json(text)) == {"a": 1, "b": [1, 2]}
+
+    def test_leaves_string_contents_untouched(self):
+        """Test that // and ,] inside string values survive cleanup."""
+        text = '{"url": "https://ornek.com/a,]", "note": "a \\"//\\" b",}'
+        assert json.loads(_clean_json(text)) == {"url": "https://ornek.com/a,]", "note": 'a "//" b'}
+
+
+class TestStructuredAnalysisHistoryWindow:
+    """Test that execute_structured_analysis() only sends recent history."""
+
+    def test_old_messages_are_trimmed(self, fake_llm):
+        """Test that messages outside the configured window are left out of the prompt."""
+        agent = AnalysisAgent(llm_service=fake_llm, prompt_manager=None)
+        history = [{"role": "user", "content": f"mesaj-{i:02d}"} for i in range(30)]
+        asyncio.run(agent.execute_structured_analysis(UserProfile(profession="Mimar"), history))
+        prompt = fake_llm.calls[0]["prompt"]
+        assert "mesaj-10" in prompt
+        assert "mesaj-09" not in prompt
+
+    def test_trimmed_facts_stay_in_profile_block(self, fake_llm):
+        """Test that facts the analysis asks about reach the prompt through the profile block."""
+        profile = UserProfile(
+            savings_info="40 altın",
+            credit_usage="Sınırlı kredi",
+            exchange_preference="Araba takası",
+            social_amenities=["Havuz", "Spor salonu"],
+            purchase_purpose="Oturum",
+            has_children=False,
+        )
+        profile.location = Location(city="Gaziantep")
+        profile.property_preferences = PropertyPreferences(property_type=PropertyType.APARTMENT, min_rooms=4)
+        agent = AnalysisAgent(llm_service=fake_llm, prompt_manager=None)
+        asyncio.run(agent.execute_structured_analysis(profile, [{"role": "user", "content": "Merhaba"}]))
+        prompt = fake_llm.calls[0]["prompt"]
+        for line in (
+            "- Birikim: 40 altın",
+            "- Kredi: Sınırlı kredi",
+            "- Takas: Araba takası",
+            "- Sosyal Alanlar: Havuz, Spor salonu",
+            "- Satın Alma Amacı: Oturum",
+            "- Çocuk: Yok",
+            "- Oda Sayısı: 4",
+            "- Hedef Lokasyon: Gaziantep",
+        ):
+            assert line in prompt
+
+
+class TestStructuredAnalysisJsonMode:
+    """Test the JSON-mode request made by execute_structured_analysis()."""
+
+    def test_requests_json_mode(self, fake_llm):
+        """Test that the structured analysis asks the provider for a bare JSON object."""
+        agent = AnalysisAgent(llm_service=fake_llm, prompt_manager=None)
+        asyncio.run(agent.execute_structured_analysis(UserProfile(profession="Mimar"), [{"role": "user", "content": "Merhaba"}]))
+        assert fake_llm.calls[0]["json_mode"] is True
+
+    def test_json_mode_can_be_disabled(self, fake_llm, monkeypatch):
+        """Test that providers without response_format support can switch JSON mode off."""
+        monkeypatch.setenv("ANALYSIS_AGENT_JSON_MODE", "false")
+        get_settings.cache_clear()
+        try:
+            agent = AnalysisAgent(llm_service=fake_llm, prompt_manager=None)
+            asyncio.run(agent.execute_structured_analysis(UserProfile(profession="Mimar"), [{"role": "user", "content": "Merhaba"}]))
+        finally:
+            get_settings.cache_clear()
+        assert fake_llm.calls[0]["json_mode"] is False
@@ -0,0 +1,72 @@
+"""Unit tests for QuestionAgent deterministic helpers."""
+
+import pytest
+from application.agents.question_agent import QuestionAgent
+from domain.entities import UserProfile
+from domain.enums import QuestionCategory
+
+
+@pytest.fixture
+def agent():
+    """QuestionAgent without LLM/prompt dependencies (deterministic paths only)."""
+    return QuestionAgent(llm_service=None, prompt_manager=None)
+
+
+class TestProfileSummary:
+    """Test QuestionAgent._get_profile_summary() rendering."""
+
+    def test_empty_profile(self, agent):
+        """Test that an empty profile yields the placeholder line."""
+        assert agent._get_profile_summary(UserProfile()) == "Hiçbir bilgi yok."
+
+    def test_only_known_fields_are_listed(self, agent):
+        """Test that known fields are rendered in order and unknown ones are skipped."""
+        profile = UserProfile()
+        profile.name = "Ali"
+        profile.profession = "Mimar"
+        profile.social_amenities = ["Havuz", "Spor salonu"]
+        assert agent._get_profile_summary(profile) == (
+            "- İsim: Ali\n"
+            "- Meslek: Mimar\n"
+            "- Sosyal Alanlar: Havuz, Spor salonu"
+        )
+
+
+class TestNaturalQuestion:
+    """Test QuestionAgent._get_natural_question() templates."""
+
+    def test_name_is_filled_in(self, agent):
+        """Test that the user's name is substituted into the template."""
+        profile = UserProfile()
+        profile.name = "Ali"
+        assert agent._get_natural_question(profile, QuestionCategory.SURNAME) == (
+            "Memnun oldum Ali! Soyadınızı da öğrenebilir miyim?"
+        )
+
+    def test_variant_is_picked_from_options(self, agent):
+        """Test that categories with several phrasings return one of them."""
+        question = agent._get_natural_question(UserProfile(), QuestionCategory.ROOMS)
+        assert question in QuestionAgent._NATURAL_QUESTIONS[QuestionCategory.ROOMS]
+
+    def test_unknown_category_falls_back(self, agent):
+        """Test that a category without templates gets the generic question."""
+        assert agent._get_natural_question(UserProfile(), QuestionCategory.SAVINGS) == (
+            "savings hakkında bilgi verir misiniz?"
+        )
+
+
+class TestFallbackQuestionSelection:
+    """Test QuestionAgent._fallback_question_selection() ordering."""
+
+    def test_highest_priority_category_wins(self, agent):
+        """Test that the earliest category in the priority order is asked first."""
+        unanswered = {QuestionCategory.PHONE_NUMBER, QuestionCategory.EMAIL, QuestionCategory.PROFESSION}
+        result = agent._fallback_question_selection(UserProfile(), unanswered)
+        assert result["category"] == QuestionCategory.PROFESSION.value
+        assert result["question"]
+
+    def test_unranked_categories_are_ignored(self, agent):
+        """Test that categories outside the priority order never produce a question."""
+        result = agent._fallback_question_selection(UserProfile(), {QuestionCategory.SAVINGS})
+        assert result["question"] is None
+        assert result["category"] is None
@@ -1,5 +1,7 @@
 """Pytest configuration and shared fixtures."""
 
+import asyncio
+
 import pytest
 from domain.value_objects import Budget, Location
 from domain.entities import UserProfile
@@ -33,3 +35,32 @@ def incomplete_user_profile():
     profile.profession = "Öğretmen"
     # Missing: surname, estimated_salary, email, current_city
     return profile
+
+
+class FakeLLM:
+    """
+    Recording stand-in for ILLMService.generate_response.
+    
+    Set ``reply`` to the text to return (or an exception to raise) and ``delay``
+    to stall each call; ``calls`` keeps the keyword arguments of every call.
+    """
+
+    def __init__(self):
+        self.reply = "{}"
+        self.delay = 0
+        self.calls = []
+
+    async def generate_response(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if isinstance(self.reply, Exception):
+            raise self.reply
+        return self.reply
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Fixture for a recording fake LLM, with the settings an agent needs to call it."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    return FakeLLM()
@@ -184,3 +184,19 @@ class TestUserProfileUpdateMethods:
         assert profile.property_preferences == prefs
         assert profile.has_answered_category(QuestionCategory.PROPERTY_TYPE)
         assert profile.has_answered_category(QuestionCategory.ROOMS)
+
+
+class TestUserProfileHobbiesText:
+    """Test the joined hobbies helper."""
+
+    def test_hobbies_text_empty_when_no_hobbies(self):
+        """Test hobbies_text is an empty string without hobbies."""
+        profile = UserProfile()
+        assert profile.hobbies_text == ""
+
+    def test_hobbies_text_follows_reassignment(self):
+        """Test hobbies_text reflects hobbies replaced after first access."""
+        profile = UserProfile(hobbies=["yüzme"])
+        assert profile.hobbies_text == "yüzme"
+        profile.hobbies = ["yüzme", "tenis"]
+        assert profile.hobbies_text == "yüzme, tenis"
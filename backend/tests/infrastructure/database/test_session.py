@@ -0,0 +1,61 @@
+"""Unit tests for database session helpers."""
+
+import asyncio
+import logging
+
+import pytest
+
+from infrastructure.config import get_settings
+from infrastructure.database import session
+
+
+class TestWarmPool:
+    """Test warm_pool() best-effort pre-connection."""
+
+    def test_connection_errors_do_not_stop_startup(self, monkeypatch, caplog):
+        """Test that failed warm-up connections are logged instead of raised."""
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("DATABASE_POOL_WARM_SIZE", "3")
+        get_settings.cache_clear()
+
+        class UnreachableEngine:
+            attempts = 0
+
+            async def connect(self):
+                UnreachableEngine.attempts += 1
+                raise OSError("connection refused")
+
+        monkeypatch.setattr(session, "get_engine", UnreachableEngine)
+        try:
+            with caplog.at_level(logging.WARNING):
+                asyncio.run(session.warm_pool())
+        finally:
+            get_settings.cache_clear()
+        assert UnreachableEngine.attempts == 3
+        assert "warm-up opened 0/3" in caplog.text
+
+
+class TestBulkUpsert:
+    """Test bulk_upsert() paging of executemany batches."""
+
+    class RecordingConnection:
+        def __init__(self):
+            self.pages = []
+
+        async def execute(self, statement, params):
+            self.pages.append(params)
+
+    @pytest.mark.parametrize("row_count, page_sizes", [
+        (0, []),
+        (3, [3]),
+        (4, [3, 1]),
+        (7, [3, 3, 1]),
+    ])
+    def test_rows_are_sent_in_pages(self, row_count, page_sizes):
+        """Test the page boundaries: no rows, exactly one page, one row over, several pages."""
+        conn = self.RecordingConnection()
+        rows = ({"id": i} for i in range(row_count))
+        sent = asyncio.run(session.bulk_upsert(conn, "INSERT INTO t (id) VALUES (:id)", rows, page_size=3))
+        assert sent == row_count
+        assert [len(page) for page in conn.pages] == page_sizes
+        assert [row["id"] for page in conn.pages for row in page] == list(range(row_count))